@@ -7,15 +7,24 @@ using OpenAI-compatible API endpoints.
 
 from __future__ import annotations
 
-import json
+import asyncio
+import atexit
+import concurrent.futures
+import contextlib
+import functools
+import gzip
+import hashlib
+import io
+import time
 import typing as t
-from datetime import datetime
 from urllib.parse import urlparse
-import time
 
 import httpx
+import msgspec
 
 from searx import logger
+from searx.cache import ExpireCache, ExpireCacheCfg
+from searx.network import get_loop
 
 if t.TYPE_CHECKING:
     from searx.result_types import EngineResults
@@ -49,24 +58,68 @@ Format your response using Markdown:
 
 Focus on the most relevant and reliable information."""
 
+# The static parts of DEFAULT_SUMMARY_PROMPT around the {query} and {results}
+# placeholders, see build_user_prompt
+_PROMPT_PRE, _PROMPT_MID = DEFAULT_SUMMARY_PROMPT.split("{query}", 1)
+_PROMPT_MID, _PROMPT_POST = _PROMPT_MID.split("{results}", 1)
+
 DEFAULT_TIMEOUT = 15.0
 DEFAULT_TIMEOUT_PER_RESULT = 5.0
 MAX_CONTENT_LENGTH = 4000
+SUMMARY_CACHE_TTL = 60 * 60  # 1h
+SUMMARY_CACHE_URLS = 5
+REQUEST_COMPRESSION_MIN_SIZE = 2048
+
+SYNC_TIMEOUT_MARGIN = 10.0
+"""Time (in sec.) that :py:obj:`generate_summary_sync` waits for the response
+in addition to the request timeout, before the request is cancelled."""
+
+HTTP_LIMITS = httpx.Limits(max_keepalive_connections=32, max_connections=128)
+"""Connection pool limits of the HTTP client shared by all API calls."""
+
+_ASYNC_CLIENT: httpx.AsyncClient | None = None
+_ASYNC_CLIENT_LOOP: asyncio.AbstractEventLoop | None = None
+
+MODELS_CACHE_TTL = 5 * 60  # 5min
+"""Time (in sec.) after which a cached model list is refreshed."""
+
+_MODELS_CACHE: dict[tuple[str, str], tuple[float, list[str]]] = {}
+_MODELS_REFRESH: dict[tuple[str, str], asyncio.Task[None]] = {}
 
 
 class SummarizerError(Exception):
     """Base exception for summarizer errors."""
-    pass
 
 
 class APIError(SummarizerError):
     """Exception raised when the API returns an error."""
-    pass
 
 
 class TimeoutError(SummarizerError):
     """Exception raised when the request times out."""
-    pass
+
+
+@functools.lru_cache(maxsize=2048)
+def _validate_host(netloc: str) -> bool:
+    """Test if ``netloc`` is a valid IDNA hostname, the result is cached per
+    host (most URLs in the results share a few hosts).
+
+    Pure ASCII hostnames (the common case) are checked without the IDNA codec,
+    the label checks are the same as those of the codec for ASCII input.
+    """
+    if netloc.isascii():
+        labels = netloc.split('.')
+        if len(labels[-1]) >= 64:
+            return False
+        return all(0 < len(label) < 64 for label in labels[:-1])
+
+    try:
+        # Test if hostname is valid IDNA - this will raise UnicodeError
+        # for invalid characters like '›' (U+203A) or other special chars
+        netloc.encode('idna')
+    except UnicodeError:
+        return False
+    return True
 
 
 def sanitize_url(url: str) -> str:
@@ -83,76 +136,344 @@ def sanitize_url(url: str) -> str:
         return url
 
     try:
-        parsed = urlparse(url)
-        if parsed.netloc:
-            # Test if hostname is valid IDNA - this will raise UnicodeError
-            # for invalid characters like '›' (U+203A) or other special chars
-            parsed.netloc.encode('idna')
-    except (UnicodeError, UnicodeDecodeError, UnicodeEncodeError):
-        logger.debug(f"Skipping URL with invalid hostname: {url}")
-        return '[Invalid URL]'
+        netloc = urlparse(url).netloc
     except Exception:
         # Catch any other parsing errors
         return '[Invalid URL]'
 
+    if netloc and not _validate_host(netloc):
+        logger.debug(f"Skipping URL with invalid hostname: {url}")
+        return '[Invalid URL]'
+
     return url
 
 
-def format_results_for_prompt(
-    results: EngineResults,
-    query: str,
-    max_results: int = 10
-) -> str:
+def get_async_client() -> httpx.AsyncClient:
+    """Return the HTTP client shared by the async API calls.  The connections of
+    an async client are bound to the event loop, a new client is created when
+    the client is used from a different event loop."""
+    global _ASYNC_CLIENT, _ASYNC_CLIENT_LOOP  # pylint: disable=global-statement
+
+    loop = asyncio.get_running_loop()
+    if _ASYNC_CLIENT is None or _ASYNC_CLIENT_LOOP is not loop:
+        if _ASYNC_CLIENT is not None and _ASYNC_CLIENT_LOOP is not None:
+            _discard_client(_ASYNC_CLIENT, _ASYNC_CLIENT_LOOP)
+        _ASYNC_CLIENT = httpx.AsyncClient(http2=True, timeout=DEFAULT_TIMEOUT, limits=HTTP_LIMITS)
+        _ASYNC_CLIENT_LOOP = loop
+    return _ASYNC_CLIENT
+
+
+def _discard_client(client: httpx.AsyncClient, loop: asyncio.AbstractEventLoop):
+    """Close a client that is replaced by a client of another event loop.  The
+    connections can only be closed in their own ``loop``: if the loop is
+    running (in another thread), the client is closed there.  Otherwise the
+    client is dropped, the sockets of a closed loop are freed by the garbage
+    collector."""
+    if loop.is_running() and not loop.is_closed():
+        asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+
+
+@atexit.register
+def _close_client():
+    if _ASYNC_CLIENT is None or _ASYNC_CLIENT_LOOP is None or _ASYNC_CLIENT_LOOP.is_closed():
+        return
+    if _ASYNC_CLIENT_LOOP.is_running():
+        # e.g. the loop of searx.network, running in its own thread
+        future = asyncio.run_coroutine_threadsafe(_ASYNC_CLIENT.aclose(), _ASYNC_CLIENT_LOOP)
+        try:
+            future.result(3)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            logger.warning("timeout closing the HTTP client")
+    else:
+        _ASYNC_CLIENT_LOOP.run_until_complete(_ASYNC_CLIENT.aclose())
+
+
+def _iso_now() -> str:
+    """Return the current UTC time in ISO format with microseconds (like
+    ``datetime.utcnow().isoformat()``)."""
+    now = time.time()
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(now)) + ".%06d" % int((now % 1) * 1e6)
+
+
+_HTTP_ERRORS = (httpx.TimeoutException, httpx.HTTPStatusError, httpx.RequestError)
+
+
+def _format_http_error(exc: httpx.HTTPStatusError) -> str:
+    """Error message of an HTTP status error, including the error message of
+    the API response (if there is one)."""
+    error_msg = f"API returned error: {exc.response.status_code}"
+    try:
+        error_data = exc.response.json()
+        if "error" in error_data:
+            error_msg = f"{error_msg} - {error_data['error'].get('message', '')}"
+    except Exception:  # pylint: disable=broad-except
+        pass
+    return error_msg
+
+
+def _error_message(exc: Exception, timeout: float) -> str:
+    """Log the exception ``exc`` of an API call and return its error message."""
+    if isinstance(exc, httpx.TimeoutException):
+        logger.warning(f"Timeout generating summary: {exc}")
+        return f"Request timed out after {timeout}s"
+    if isinstance(exc, httpx.HTTPStatusError):
+        error_msg = _format_http_error(exc)
+        logger.warning(error_msg)
+        return error_msg
+    if isinstance(exc, httpx.RequestError):
+        logger.warning(f"Request error generating summary: {exc}")
+        return f"Request failed: {exc}"
+    logger.error(f"Unexpected error generating summary: {exc}")
+    return f"Unexpected error: {exc}"
+
+
+def _summarizer_error(exc: Exception, timeout: float) -> SummarizerError:
+    """Map the exception ``exc`` of an API call to a :py:obj:`SummarizerError`."""
+    error_msg = _error_message(exc, timeout)
+    if isinstance(exc, httpx.TimeoutException):
+        return TimeoutError(error_msg)
+    return APIError(error_msg)
+
+
+def _error_response(error: str, model: str, timestamp: str) -> dict[str, t.Any]:
+    return {
+        "success": False,
+        "summary": None,
+        "error": error,
+        "model": model,
+        "timestamp": timestamp,
+        "usage": None,
+        "stats": None,
+    }
+
+
+@functools.lru_cache(maxsize=16)
+def _api_url(endpoint: str, path: str) -> str:
+    """Return the URL of the API ``path`` at ``endpoint``.  The endpoint may be
+    given with or without the ``/v1`` suffix of OpenAI-compatible APIs, the
+    result is cached (the endpoint is fixed per instance)."""
+    endpoint = endpoint.rstrip('/')
+    if not endpoint.endswith('/v1'):
+        endpoint = f"{endpoint}/v1"
+    return f"{endpoint}/{path}"
+
+
+def _result_field(result: t.Any, *names: str) -> str:
+    """Return the first non-empty field of a result, which might be a dict
+    (JSON from the web client) or a result object."""
+    for name in names:
+        if isinstance(result, dict):
+            value = result.get(name)
+        else:
+            value = getattr(result, name, None)
+        if value:
+            return value
+    return ''
+
+
+def _api_key_hash(api_key: str | None) -> str:
+    """Short hash of the API key, used in cache keys instead of the key."""
+    return hashlib.blake2b((api_key or "").encode(), digest_size=8).hexdigest()
+
+
+class SummaryCache:
+    """Cache of generated summaries, stored in a :py:obj:`searx.cache.ExpireCache`.
+
+    A summary is looked up by a key that is built from the *normalized* query
+    and the URLs of the top results (:py:obj:`SUMMARY_CACHE_URLS`).  The query
+    is normalized to a case-folded bag of words, so trivial variations of the
+    same query (case, word order, whitespace) share one entry, while a changed
+    result set never serves a stale summary.  The parameters of the API call
+    (endpoint, hash of the API key, model, prompt, ..) are part of the key.
+
+    Only the key is hashed (:py:obj:`secret_hash
+    <searx.cache.ExpireCache.secret_hash>`), the query term is not stored in
+    the DB.  The summaries (which may quote the query) are stored in plain
+    text.
+    """
+
+    def __init__(self):
+        self._cache: ExpireCache | None = None
+
+    @property
+    def cache(self) -> ExpireCache:
+        if self._cache is None:
+            self._cache = ExpireCache.build_cache(
+                ExpireCacheCfg(
+                    name="AI_SUMMARY_CACHE",
+                    MAX_VALUE_LEN=1024 * 50,
+                    MAXHOLD_TIME=60 * 60 * 24,  # 1 day
+                )
+            )
+        return self._cache
+
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        return " ".join(sorted(set(query.casefold().split())))
+
+    def key(self, results: t.Iterable[t.Any], query: str, **params: t.Any) -> str:
+        """Build the cache key of a summary request.  The ``params`` are the
+        arguments of the API call that have an effect on the summary."""
+        urls: list[str] = []
+        for result in results:
+            if len(urls) >= SUMMARY_CACHE_URLS:
+                break
+            url = _result_field(result, 'url', 'link')
+            if url:
+                urls.append(url)
+
+        parts = [self.normalize_query(query), "\n".join(sorted(urls))]
+        parts.extend(f"{name}={params[name]}" for name in sorted(params))
+        return self.cache.secret_hash("\x00".join(parts))
+
+    def get(self, key: str) -> dict[str, t.Any] | None:
+        """Return the cached response of ``key`` (with a new timestamp) or
+        ``None`` if there is no such summary in the cache."""
+        value = self.cache.get(key)
+        if value is None:
+            return None
+
+        stats = value.get("stats")
+        if stats is not None:
+            stats = {**stats, "cache_hit": True}
+
+        logger.debug("summary cache hit for model %s", value.get("model"))
+        return {
+            **value,
+            "success": True,
+            "error": None,
+            "timestamp": _iso_now(),
+            "stats": stats,
+        }
+
+    def put(self, key: str, response: dict[str, t.Any], ttl: int = SUMMARY_CACHE_TTL) -> bool:
+        """Store a successful ``response`` for ``ttl`` seconds."""
+        if not response.get("success"):
+            return False
+        value = {k: response.get(k) for k in ("summary", "model", "usage", "stats")}
+        return self.cache.set(key, value, expire=ttl)
+
+
+SUMMARY_CACHE = SummaryCache()
+"""Global :py:obj:`SummaryCache` used by :py:obj:`generate_summary` and
+:py:obj:`generate_summary_sync`."""
+
+
+def build_user_prompt(query: str, formatted_results: str) -> str:
+    """Build the user prompt from :py:obj:`DEFAULT_SUMMARY_PROMPT`, the result
+    is the same as ``DEFAULT_SUMMARY_PROMPT.format(query=.., results=..)``
+    without parsing the template on each call."""
+    return "".join((_PROMPT_PRE, query, _PROMPT_MID, formatted_results, _PROMPT_POST))
+
+
+def format_results_for_prompt(results: EngineResults | list[dict], query: str, max_results: int = 10) -> str:
     """Format search results into a prompt suitable for AI summarization.
 
     Args:
-        results: The search results to format
+        results: The search results to format (result objects or dicts)
         query: The original search query
         max_results: Maximum number of results to include in the prompt
 
     Returns:
         A formatted string containing the search results
     """
-    lines = [
-        f"Search Query: {query}",
-        "",
-        "Search Results:",
-        "",
-    ]
-
-    result_count = 0
+    if max_results <= 0:
+        return _format_results(query, (), 0)
+
+    max_content = MAX_CONTENT_LENGTH // max_results
+    fields: list[tuple[str, str, str]] = []
     for result in results:
-        if result_count >= max_results:
+        if len(fields) >= max_results:
             break
 
-        # Extract title and content from result
-        title = getattr(result, 'title', '') or getattr(result, 'name', '')
-        content = getattr(result, 'content', '') or getattr(result, 'description', '')
-        url = getattr(result, 'url', '') or getattr(result, 'link', '')
+        # Extract title and content from result (object or dict)
+        title = _result_field(result, 'title', 'name')
+        content = _result_field(result, 'content', 'description')
+        url = _result_field(result, 'url', 'link')
 
         if not title and not content:
             continue
+        # the cache of _format_results does not need to hold the full content,
+        # one more char than max_content is enough to detect the truncation
+        fields.append((title, content[: max_content + 1], url))
+
+    return _format_results(query, tuple(fields), max_content)
+
+
+@functools.lru_cache(maxsize=64)
+def _format_results(query: str, fields: tuple[tuple[str, str, str], ...], max_content: int) -> str:
+    """Build the prompt of :py:obj:`format_results_for_prompt` from the
+    ``(title, content, url)`` fields of the results.  The prompt is cached, a
+    repeated query with the same results (reload, multiple tabs) does not
+    rebuild it."""
+    buf = io.StringIO()
+    w = buf.write
+    w("Search Query: ")
+    w(query)
+    w("\n\nSearch Results:\n")
 
-        result_count += 1
-        lines.append(f"{result_count}. {title}")
+    for result_count, (title, content, url) in enumerate(fields, 1):
+        w(f"\n{result_count}. {title}")
 
         if content:
             # Truncate content if too long
-            if len(content) > MAX_CONTENT_LENGTH // max_results:
-                content = content[: MAX_CONTENT_LENGTH // max_results] + "..."
-            lines.append(f"   Content: {content}")
+            w("\n   Content: ")
+            if len(content) > max_content:
+                w(content[:max_content])
+                w("...")
+            else:
+                w(content)
 
         if url:
             # Sanitize URL to handle invalid IDNA hostnames
-            safe_url = sanitize_url(url)
-            lines.append(f"   URL: {safe_url}")
+            w("\n   URL: ")
+            w(sanitize_url(url))
+
+        w("\n")
 
-        lines.append("")
+    if not fields:
+        w("\nNo results found.")
 
-    if result_count == 0:
-        lines.append("No results found.")
+    return buf.getvalue()
 
-    return "\n".join(lines)
+
+def _models_cache_key(endpoint: str, api_key: str | None) -> tuple[str, str]:
+    return endpoint, _api_key_hash(api_key)
+
+
+async def _fetch_models(endpoint: str, api_key: str | None, timeout: float) -> list[str] | None:
+    """Fetch the model IDs from the API endpoint, returns ``None`` on error."""
+    url = _api_url(endpoint, "models")
+    headers: dict[str, str] = {}
+
+    if api_key:
+        headers["Authorization"] = f"Bearer {api_key}"
+
+    try:
+        client = get_async_client()
+        response = await client.get(url, headers=headers, timeout=timeout)
+        response.raise_for_status()
+        data = msgspec.json.decode(response.content)
+
+        models = data.get("data", [])
+        model_ids = [model.get("id", "") for model in models if model.get("id")]
+        logger.debug(f"Fetched {len(model_ids)} models from {endpoint}")
+
+    except Exception as e:
+        logger.warning(f"Error fetching models from {endpoint}: {e}")
+        return None
+
+    _MODELS_CACHE[_models_cache_key(endpoint, api_key)] = (time.monotonic(), model_ids)
+    return model_ids
+
+
+async def _refresh_models(endpoint: str, api_key: str | None, timeout: float):
+    key = _models_cache_key(endpoint, api_key)
+    try:
+        await _fetch_models(endpoint, api_key, timeout)
+    finally:
+        _MODELS_REFRESH.pop(key, None)
 
 
 async def fetch_available_models(
@@ -162,6 +483,10 @@ async def fetch_available_models(
 ) -> list[str]:
     """Fetch available models from the OpenAI-compatible API endpoint.
 
+    The model list is cached per endpoint and API key (:py:obj:`MODELS_CACHE_TTL`).
+    When the cached list has expired, it is returned nevertheless and a refresh
+    is started in the background.
+
     Args:
         endpoint: The base URL of the API endpoint (e.g., "https://api.openai.com/v1")
         api_key: Optional API key for authentication
@@ -170,115 +495,89 @@ async def fetch_available_models(
     Returns:
         List of model IDs, or empty list on error
     """
-    url = f"{endpoint.rstrip('/')}/v1/models"
-    headers: dict[str, str] = {}
+    key = _models_cache_key(endpoint, api_key)
+    cached = _MODELS_CACHE.get(key)
 
-    if api_key:
-        headers["Authorization"] = f"Bearer {api_key}"
-
-    try:
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            response = await client.get(url, headers=headers)
-            response.raise_for_status()
-            data = response.json()
-
-            models = data.get("data", [])
-            model_ids = [model.get("id", "") for model in models if model.get("id")]
-            logger.debug(f"Fetched {len(model_ids)} models from {endpoint}")
+    if cached is not None:
+        fetched, model_ids = cached
+        if time.monotonic() - fetched >= MODELS_CACHE_TTL and key not in _MODELS_REFRESH:
+            _MODELS_REFRESH[key] = asyncio.create_task(_refresh_models(endpoint, api_key, timeout))
+        return list(model_ids)
 
-            return model_ids
-
-    except Exception as e:
-        logger.warning(f"Error fetching models from {endpoint}: {e}")
-        return []
+    model_ids = await _fetch_models(endpoint, api_key, timeout)
+    return list(model_ids) if model_ids is not None else []
 
 
-def generate_summary_sync(
-    results: list[dict],
-    query: str,
-    endpoint: str,
-    model: str,
-    api_key: str | None = None,
-    system_prompt: str | None = None,
-    timeout: float = DEFAULT_TIMEOUT,
-    max_tokens: int = 500,
-    temperature: float = 0.7,
-) -> dict[str, t.Any]:
-    """Generate AI summary synchronously (blocking call).
+async def fetch_available_models_many(
+    endpoints: list[tuple[str, str | None]],
+    timeout: float = 10,
+) -> dict[str, list[str]]:
+    """Fetch the available models of several endpoints concurrently, see
+    :py:obj:`fetch_available_models`.
 
     Args:
-        results: List of search result dicts with 'title', 'content', 'url' keys
-        query: The original search query
-        endpoint: The base URL of the API endpoint
-        model: The model ID to use for summarization
-        api_key: Optional API key for authentication
-        system_prompt: Optional custom system prompt
-        timeout: Request timeout in seconds
-        max_tokens: Maximum tokens in the response
-        temperature: Temperature for generation (0.0 to 1.0)
+        endpoints: List of ``(endpoint, api_key)`` tuples
+        timeout: Request timeout in seconds (default: 10)
 
     Returns:
-        A dictionary with success, summary, error, model, timestamp, usage, stats
+        Dictionary mapping each endpoint to its list of model IDs (empty
+        list on error)
     """
-    timestamp = datetime.utcnow().isoformat()
+    results = await asyncio.gather(
+        *(fetch_available_models(endpoint, api_key, timeout) for endpoint, api_key in endpoints),
+        return_exceptions=True,
+    )
+    return {endpoint: result if isinstance(result, list) else [] for (endpoint, _), result in zip(endpoints, results)}
 
-    # Ensure endpoint has /v1 suffix
-    endpoint = endpoint.rstrip('/')
-    if not endpoint.endswith('/v1'):
-        endpoint = f"{endpoint}/v1"
-    api_url = f"{endpoint}/chat/completions"
 
+def _api_headers(api_key: str | None) -> dict[str, str]:
     headers: dict[str, str] = {
         "Content-Type": "application/json",
     }
 
     if api_key:
         headers["Authorization"] = f"Bearer {api_key}"
+    return headers
 
-    # Format results into prompt text
-    lines = [f"Search Query: {query}", "", "Search Results:", ""]
-    for i, result in enumerate(results, 1):
-        title = result.get('title', '')
-        content = result.get('content', '')
-        url = result.get('url', '')
 
-        if not title and not content:
-            continue
+def _encode_body(payload: dict[str, t.Any], headers: dict[str, str], compress: bool) -> bytes:
+    """Encode the request body.  With ``compress``, bodies larger than
+    :py:obj:`REQUEST_COMPRESSION_MIN_SIZE` are gzip compressed and the
+    ``Content-Encoding`` header is set."""
+    body = msgspec.json.encode(payload)
+    if compress and len(body) > REQUEST_COMPRESSION_MIN_SIZE:
+        body = gzip.compress(body, compresslevel=6)
+        headers["Content-Encoding"] = "gzip"
+    return body
 
-        lines.append(f"{i}. {title}")
-        if content:
-            # Truncate content if too long
-            max_content = MAX_CONTENT_LENGTH // len(results) if results else MAX_CONTENT_LENGTH
-            if len(content) > max_content:
-                content = content[:max_content] + "..."
-            lines.append(f"   Content: {content}")
-        if url:
-            # Sanitize URL to handle invalid IDNA hostnames
-            safe_url = sanitize_url(url)
-            lines.append(f"   URL: {safe_url}")
-        lines.append("")
 
-    if len(lines) <= 4:  # Only header lines, no results
-        lines.append("No results found.")
+def _build_payload(
+    results: EngineResults | list[dict],
+    query: str,
+    model: str,
+    system_prompt: str | None,
+    max_tokens: int,
+    temperature: float,
+    max_results: int,
+) -> dict[str, t.Any]:
+    """Build the payload of a chat completion request."""
 
-    formatted_results = "\n".join(lines)
+    # Format results for the prompt
+    formatted_results = format_results_for_prompt(results, query, max_results=max_results)
 
     # Build the user prompt
-    user_prompt = DEFAULT_SUMMARY_PROMPT.format(
-        query=query,
-        results=formatted_results
-    )
+    user_prompt = build_user_prompt(query, formatted_results)
 
     # Use default system prompt if none provided
     if system_prompt is None:
         system_prompt = DEFAULT_SYSTEM_PROMPT
-    
+
     if '{query}' in system_prompt:
         system_prompt = system_prompt.replace('{query}', query)
     if '{results}' in system_prompt:
         system_prompt = system_prompt.replace('{results}', formatted_results)
 
-    payload = {
+    return {
         "model": model,
         "messages": [
             {"role": "system", "content": system_prompt},
@@ -288,117 +587,154 @@ def generate_summary_sync(
         "temperature": temperature,
     }
 
-    start_time = time.time()
 
-    try:
-        # Use sync client instead of async - create explicit timeout object
-        timeout_obj = httpx.Timeout(timeout, connect=10.0)
-        with httpx.Client(timeout=timeout_obj) as client:
-            response = client.post(api_url, headers=headers, json=payload)
-            response.raise_for_status()
-            data = response.json()
-
-            # Calculate response time
-            response_time = round(time.time() - start_time, 2)
-
-            # Extract summary from response
-            choices = data.get("choices", [])
-            if not choices:
-                logger.warning("No choices in API response")
-                return {
-                    "success": False,
-                    "summary": None,
-                    "error": "No completion returned from API",
-                    "model": model,
-                    "timestamp": timestamp,
-                    "usage": None,
-                    "stats": None,
-                }
+def _summary_cache_key(results: t.Iterable[t.Any], query: str, api_key: str | None, **params: t.Any) -> str:
+    """Cache key of a summary, the API key is hashed (see :py:obj:`SummaryCache`)."""
+    return SUMMARY_CACHE.key(results, query, api_key=_api_key_hash(api_key), **params)
 
-            message = choices[0].get("message", {})
-            summary = message.get("content", "").strip()
-
-            # Extract usage stats
-            usage = data.get("usage", {})
-            stats = {
-                "prompt_tokens": usage.get("prompt_tokens", 0),
-                "completion_tokens": usage.get("completion_tokens", 0),
-                "total_tokens": usage.get("total_tokens", 0),
-                "model": model,
-                "response_time": response_time,
-            }
 
-            logger.debug(f"Generated summary using model {model}")
+async def _post_summary(
+    url: str,
+    headers: dict[str, str],
+    body: bytes,
+    model: str,
+    timeout: float,
+    connect_timeout: float | None = None,
+) -> dict[str, t.Any]:
+    """Send the chat completion request and build the response of
+    :py:obj:`generate_summary` (the summary cache is not used here)."""
+    if connect_timeout is None:
+        connect_timeout = timeout
 
-            return {
-                "success": True,
-                "summary": summary,
-                "error": None,
-                "model": model,
-                "timestamp": timestamp,
-                "usage": usage,
-                "stats": stats,
-            }
+    timestamp = _iso_now()
+    start_time = time.monotonic()
 
-    except httpx.TimeoutException:
-        logger.warning("Timeout generating summary")
-        return {
-            "success": False,
-            "summary": None,
-            "error": f"Request timed out after {timeout}s",
+    try:
+        client = get_async_client()
+        response = await client.post(
+            url, headers=headers, content=body, timeout=httpx.Timeout(timeout, connect=connect_timeout)
+        )
+        response.raise_for_status()
+        data = msgspec.json.decode(response.content)
+
+        # Calculate response time
+        response_time = round(time.monotonic() - start_time, 2)
+
+        # Extract summary from response
+        choices = data.get("choices", [])
+        if not choices:
+            logger.warning("No choices in API response")
+            return _error_response("No completion returned from API", model, timestamp)
+
+        message = choices[0].get("message", {})
+        summary = message.get("content", "").strip()
+
+        # Extract usage stats
+        usage = data.get("usage") or {}
+        stats = {
+            "prompt_tokens": usage.get("prompt_tokens", 0),
+            "completion_tokens": usage.get("completion_tokens", 0),
+            "total_tokens": usage.get("total_tokens", 0),
             "model": model,
-            "timestamp": timestamp,
-            "usage": None,
-            "stats": None,
+            "response_time": response_time,
         }
 
-    except httpx.HTTPStatusError as e:
-        error_msg = f"API returned error: {e.response.status_code}"
-        try:
-            error_data = e.response.json()
-            if "error" in error_data:
-                error_msg = f"{error_msg} - {error_data['error'].get('message', '')}"
-        except Exception:
-            pass
-        logger.warning(error_msg)
-        return {
-            "success": False,
-            "summary": None,
-            "error": error_msg,
-            "model": model,
-            "timestamp": timestamp,
-            "usage": None,
-            "stats": None,
-        }
+        logger.debug(f"Generated summary using model {model}")
 
-    except httpx.RequestError as e:
-        logger.warning(f"Request error generating summary: {e}")
         return {
-            "success": False,
-            "summary": None,
-            "error": f"Request failed: {e}",
+            "success": True,
+            "summary": summary,
+            "error": None,
             "model": model,
             "timestamp": timestamp,
-            "usage": None,
-            "stats": None,
+            "usage": usage,
+            "stats": stats,
         }
 
-    except Exception as e:
+    except _HTTP_ERRORS as e:
+        raise _summarizer_error(e, timeout) from e
+
+
+def generate_summary_sync(
+    results: list[dict],
+    query: str,
+    endpoint: str,
+    model: str,
+    api_key: str | None = None,
+    system_prompt: str | None = None,
+    timeout: float = DEFAULT_TIMEOUT,
+    max_tokens: int = 500,
+    temperature: float = 0.7,
+    compress: bool = False,
+) -> dict[str, t.Any]:
+    """Generate AI summary synchronously (blocking call).
+
+    Only the API request runs in the event loop of :py:obj:`searx.network`
+    (the shared HTTP client and its connections are kept in this loop), the
+    summary cache, the prompt and the request body are handled in the calling
+    thread and do not block the loop.  All results of the request are used for
+    the prompt.  Errors are not raised, they are returned in the ``error``
+    field.
+
+    Args:
+        results: List of search result dicts with 'title', 'content', 'url' keys
+        query: The original search query
+        endpoint: The base URL of the API endpoint
+        model: The model ID to use for summarization
+        api_key: Optional API key for authentication
+        system_prompt: Optional custom system prompt
+        timeout: Request timeout in seconds (connect timeout: 10 sec.)
+        max_tokens: Maximum tokens in the response
+        temperature: Temperature for generation (0.0 to 1.0)
+        compress: Compress the request body (gzip), the endpoint must support it
+
+    Returns:
+        A dictionary with success, summary, error, model, timestamp, usage, stats
+    """
+    max_results = max(len(results), 1)
+    try:
+        cache_key = _summary_cache_key(
+            results,
+            query,
+            api_key,
+            endpoint=endpoint,
+            model=model,
+            system_prompt=system_prompt,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            max_results=max_results,
+        )
+        cached = SUMMARY_CACHE.get(cache_key)
+        if cached is not None:
+            return cached
+
+        url = _api_url(endpoint, "chat/completions")
+        headers = _api_headers(api_key)
+        payload = _build_payload(results, query, model, system_prompt, max_tokens, temperature, max_results)
+        body = _encode_body(payload, headers, compress)
+
+        future = asyncio.run_coroutine_threadsafe(
+            _post_summary(url, headers, body, model, timeout, connect_timeout=10.0), get_loop()
+        )
+        try:
+            result = future.result(timeout + SYNC_TIMEOUT_MARGIN)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            logger.warning(f"Timeout generating summary: no response after {timeout + SYNC_TIMEOUT_MARGIN}s")
+            return _error_response(f"Request timed out after {timeout}s", model, _iso_now())
+
+        SUMMARY_CACHE.put(cache_key, result)
+        return result
+
+    except SummarizerError as e:
+        return _error_response(str(e), model, _iso_now())
+    except Exception as e:  # pylint: disable=broad-except
         # Catch any unexpected errors (e.g., from URL processing, etc.)
-        logger.error(f"Unexpected error generating summary: {e}")
-        return {
-            "success": False,
-            "summary": None,
-            "error": f"Unexpected error: {e}",
-            "model": model,
-            "timestamp": timestamp,
-            "usage": None,
-            "stats": None,
-        }
+        return _error_response(_error_message(e, timeout), model, _iso_now())
 
 
 async def generate_summary(
-    results: EngineResults,
+    results: EngineResults | list[dict],
     query: str,
     endpoint: str,
     model: str,
@@ -407,9 +743,15 @@ async def generate_summary(
     timeout: float = DEFAULT_TIMEOUT,
     max_tokens: int = 500,
     temperature: float = 0.7,
+    max_results: int = 10,
+    compress: bool = False,
 ) -> dict[str, t.Any]:
     """Generate an AI summary of search results.
 
+    The summary cache (SQLite) and the compression of the request body are
+    blocking, they are run in a worker thread (:py:obj:`asyncio.to_thread`) to
+    not block the event loop.
+
     Args:
         results: The search results to summarize
         query: The original search query
@@ -420,6 +762,8 @@ async def generate_summary(
         timeout: Request timeout in seconds
         max_tokens: Maximum tokens in the response
         temperature: Temperature for generation (0.0 to 1.0)
+        max_results: Maximum number of results to include in the prompt
+        compress: Compress the request body (gzip), the endpoint must support it
 
     Returns:
         A dictionary containing:
@@ -429,100 +773,62 @@ async def generate_summary(
         - model: The model used
         - timestamp: ISO format timestamp
         - usage: Token usage information (if available)
+        - stats: Token counts, model and response time (if successful)
 
     Raises:
         APIError: If the API returns an error response
         TimeoutError: If the request times out
     """
-    # Ensure endpoint has /v1 suffix for OpenAI-compatible APIs
-    endpoint = endpoint.rstrip('/')
-    if not endpoint.endswith('/v1'):
-        endpoint = f"{endpoint}/v1"
-    url = f"{endpoint}/chat/completions"
-
-    headers: dict[str, str] = {
-        "Content-Type": "application/json",
-    }
-
-    if api_key:
-        headers["Authorization"] = f"Bearer {api_key}"
-
-    # Format results for the prompt
-    formatted_results = format_results_for_prompt(results, query)
-
-    # Build the user prompt
-    user_prompt = DEFAULT_SUMMARY_PROMPT.format(
-        query=query,
-        results=formatted_results
+    cache_key = await asyncio.to_thread(
+        _summary_cache_key,
+        results,
+        query,
+        api_key,
+        endpoint=endpoint,
+        model=model,
+        system_prompt=system_prompt,
+        max_tokens=max_tokens,
+        temperature=temperature,
+        max_results=max_results,
     )
-
-    # Use default system prompt if none provided
-    if system_prompt is None:
-        system_prompt = DEFAULT_SYSTEM_PROMPT
-
-    payload = {
-        "model": model,
-        "messages": [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_prompt},
-        ],
-        "max_tokens": max_tokens,
-        "temperature": temperature,
-    }
-
-    timestamp = datetime.utcnow().isoformat()
-
-    try:
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            response = await client.post(url, headers=headers, json=payload)
-            response.raise_for_status()
-            data = response.json()
-
-            # Extract summary from response
-            choices = data.get("choices", [])
-            if not choices:
-                logger.warning("No choices in API response")
-                return {
-                    "success": False,
-                    "summary": None,
-                    "error": "No completion returned from API",
-                    "model": model,
-                    "timestamp": timestamp,
-                    "usage": None,
-                }
-
-            message = choices[0].get("message", {})
-            summary = message.get("content", "").strip()
-
-            logger.debug(f"Generated summary using model {model}")
-
-            return {
-                "success": True,
-                "summary": summary,
-                "error": None,
-                "model": model,
-                "timestamp": timestamp,
-                "usage": data.get("usage"),
-            }
-
-    except httpx.TimeoutException as e:
-        logger.warning(f"Timeout generating summary: {e}")
-        raise TimeoutError(f"Request timed out after {timeout}s") from e
-
-    except httpx.HTTPStatusError as e:
-        error_msg = f"API returned error: {e.response.status_code}"
-        try:
-            error_data = e.response.json()
-            if "error" in error_data:
-                error_msg = f"{error_msg} - {error_data['error'].get('message', '')}"
-        except Exception:
-            pass
-        logger.warning(error_msg)
-        raise APIError(error_msg) from e
-
-    except httpx.RequestError as e:
-        logger.warning(f"Request error generating summary: {e}")
-        raise APIError(f"Request failed: {e}") from e
+    cached = await asyncio.to_thread(SUMMARY_CACHE.get, cache_key)
+    if cached is not None:
+        return cached
+
+    url = _api_url(endpoint, "chat/completions")
+    headers = _api_headers(api_key)
+    payload = _build_payload(results, query, model, system_prompt, max_tokens, temperature, max_results)
+    body = await asyncio.to_thread(_encode_body, payload, headers, compress)
+
+    result = await _post_summary(url, headers, body, model, timeout)
+    await asyncio.to_thread(SUMMARY_CACHE.put, cache_key, result)
+    return result
+
+
+async def _aiter_sse_data(response: httpx.Response) -> t.AsyncGenerator[bytes, None]:
+    """Yield the payloads of the ``data:`` lines of a server-sent events
+    stream, up to the ``data: [DONE]`` line.  The stream is framed on bytes,
+    lines are not decoded to str.
+
+    The body is not read after ``[DONE]``, a server may keep the response open
+    (the stream would then end in a read timeout)."""
+    buf = bytearray()
+    async for chunk in response.aiter_bytes():
+        buf += chunk
+        start = 0
+        while (end := buf.find(b"\n", start)) != -1:
+            line = bytes(buf[start:end]).strip()
+            start = end + 1
+            if line == b"data: [DONE]":
+                return
+            if line.startswith(b"data: "):
+                yield line[6:]
+        del buf[:start]
+
+    # last line of the stream without a line break
+    line = bytes(buf).strip()
+    if line.startswith(b"data: ") and line != b"data: [DONE]":
+        yield line[6:]
 
 
 async def stream_generate_summary(
@@ -535,6 +841,7 @@ async def stream_generate_summary(
     timeout: float = DEFAULT_TIMEOUT,
     max_tokens: int = 500,
     temperature: float = 0.7,
+    compress: bool = False,
 ) -> t.AsyncGenerator[str, None]:
     """Stream an AI summary of search results.
 
@@ -548,6 +855,7 @@ async def stream_generate_summary(
         timeout: Request timeout in seconds
         max_tokens: Maximum tokens in the response
         temperature: Temperature for generation (0.0 to 1.0)
+        compress: Compress the request body (gzip), the endpoint must support it
 
     Yields:
         Chunks of the generated summary as they arrive from the API
@@ -556,90 +864,34 @@ async def stream_generate_summary(
         APIError: If the API returns an error response
         TimeoutError: If the request times out
     """
-    # Ensure endpoint has /v1 suffix for OpenAI-compatible APIs
-    endpoint = endpoint.rstrip('/')
-    if not endpoint.endswith('/v1'):
-        endpoint = f"{endpoint}/v1"
-    url = f"{endpoint}/chat/completions"
-
-    headers: dict[str, str] = {
-        "Content-Type": "application/json",
-    }
-
-    if api_key:
-        headers["Authorization"] = f"Bearer {api_key}"
-
-    # Format results for the prompt
-    formatted_results = format_results_for_prompt(results, query)
-
-    # Build the user prompt
-    user_prompt = DEFAULT_SUMMARY_PROMPT.format(
-        query=query,
-        results=formatted_results
-    )
-
-    # Use default system prompt if none provided
-    if system_prompt is None:
-        system_prompt = DEFAULT_SYSTEM_PROMPT
-
-    payload = {
-        "model": model,
-        "messages": [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_prompt},
-        ],
-        "max_tokens": max_tokens,
-        "temperature": temperature,
-        "stream": True,  # Enable streaming
-    }
+    url = _api_url(endpoint, "chat/completions")
+    headers = _api_headers(api_key)
+    payload = _build_payload(results, query, model, system_prompt, max_tokens, temperature, max_results=10)
+    payload["stream"] = True  # Enable streaming
 
     try:
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            async with client.stream("POST", url, headers=headers, json=payload) as response:
-                response.raise_for_status()
+        client = get_async_client()
+        body = _encode_body(payload, headers, compress)
+        async with client.stream("POST", url, headers=headers, content=body, timeout=timeout) as response:
+            response.raise_for_status()
 
-                async for line in response.aiter_lines():
-                    line = line.strip()
-                    if not line:
+            # OpenAI streaming format: data: {"choices": [{"delta": {"content": "text"}}]}
+            async with contextlib.aclosing(_aiter_sse_data(response)) as sse_data:
+                async for data in sse_data:
+                    try:
+                        chunk_data = msgspec.json.decode(data)
+                        choices = chunk_data.get("choices", [])
+                        if choices:
+                            delta = choices[0].get("delta", {})
+                            content = delta.get("content", "")
+                            if content:
+                                yield content
+                    except msgspec.DecodeError:
+                        logger.warning(f"Failed to parse streaming chunk: {data!r}")
                         continue
 
-                    # OpenAI streaming format: data: {"choices": [{"delta": {"content": "text"}}]}
-                    if line.startswith("data: "):
-                        data = line[6:]  # Remove "data: " prefix
-
-                        if data == "[DONE]":
-                            break
-
-                        try:
-                            chunk_data = json.loads(data)
-                            choices = chunk_data.get("choices", [])
-                            if choices:
-                                delta = choices[0].get("delta", {})
-                                content = delta.get("content", "")
-                                if content:
-                                    yield content
-                        except json.JSONDecodeError:
-                            logger.warning(f"Failed to parse streaming chunk: {data}")
-                            continue
-
-    except httpx.TimeoutException as e:
-        logger.warning(f"Timeout generating summary: {e}")
-        raise TimeoutError(f"Request timed out after {timeout}s") from e
-
-    except httpx.HTTPStatusError as e:
-        error_msg = f"API returned error: {e.response.status_code}"
-        try:
-            error_data = e.response.json()
-            if "error" in error_data:
-                error_msg = f"{error_msg} - {error_data['error'].get('message', '')}"
-        except Exception:
-            pass
-        logger.warning(error_msg)
-        raise APIError(error_msg) from e
-
-    except httpx.RequestError as e:
-        logger.warning(f"Request error generating summary: {e}")
-        raise APIError(f"Request failed: {e}") from e
+    except _HTTP_ERRORS as e:
+        raise _summarizer_error(e, timeout) from e
 
 
 def should_generate_summary(
@@ -664,24 +916,20 @@ def should_generate_summary(
     Returns:
         True if a summary should be generated, False otherwise
     """
-    if preferences is None:
+    if not preferences:
         return False
 
-    ai_config = preferences.get("ai_summarizer", {})
-
     # Check if AI summarization is enabled
-    if not ai_config.get("enabled", False):
+    ai_config = preferences.get("ai_summarizer")
+    if not ai_config or not ai_config.get("enabled"):
         return False
 
     # Check if we have enough results to summarize
-    min_results = ai_config.get("min_results", 3)
-    if results_count < min_results:
+    if results_count < ai_config.get("min_results", 3):
         return False
 
     # Check if endpoint and model are configured
-    endpoint = ai_config.get("endpoint", "")
-    model = ai_config.get("model", "")
-    if not endpoint or not model:
+    if not (ai_config.get("endpoint") and ai_config.get("model")):
         logger.debug("AI summarization enabled but endpoint or model not configured")
         return False
 
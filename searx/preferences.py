@@ -516,6 +516,10 @@ class Preferences:
                 '500',
                 locked=is_locked('ai_max_tokens')
             ),
+            'ai_compress_requests': BooleanSetting(
+                False,
+                locked=is_locked('ai_compress_requests')
+            ),
             'ai_system_prompt': StringSetting(
                 'You are a helpful assistant that summarizes search results. We are looking for this information {query} Provide a concise summary of the search results in no more than 2-3 paragraphs from these web pages: {results}. Focus on the most relevant information.',
                 locked=is_locked('ai_system_prompt')
@@ -822,6 +822,7 @@ def generate_summary():
     timeout_per_result = int(sxng_request.preferences.get_value("ai_timeout_per_result")) if sxng_request.preferences and sxng_request.preferences.get_value("ai_timeout_per_result") else 5
     max_tokens = int(sxng_request.preferences.get_value("ai_max_tokens")) if sxng_request.preferences and sxng_request.preferences.get_value("ai_max_tokens") else 500
     system_prompt = sxng_request.preferences.get_value("ai_system_prompt") if sxng_request.preferences else ""
+    compress = sxng_request.preferences.get_value("ai_compress_requests") if sxng_request.preferences else False
     timeout = 15 + (timeout_per_result * num_results)
 
     if not endpoint or not model:
@@ -838,6 +839,7 @@ def generate_summary():
             timeout=timeout,
             max_tokens=max_tokens,
             system_prompt=system_prompt if system_prompt else None,
+            compress=compress,
         )
         return jsonify({
             "success": result.get("success", False),
@@ -0,0 +1,526 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# pylint: disable=missing-module-docstring,disable=missing-class-docstring,invalid-name
+
+import asyncio
+import datetime
+import gzip
+import os
+import tempfile
+import threading
+from types import SimpleNamespace
+
+import httpx
+import msgspec
+from parameterized.parameterized import parameterized
+
+from searx import ai_summarizer
+from searx.cache import ExpireCache, ExpireCacheCfg
+from searx.network import get_loop
+from tests import SearxTestCase
+
+RESULTS = [
+    {"title": "Foo", "content": "foo content", "url": "https://example.org/foo"},
+    {"title": "Bar", "content": "bar content", "url": "https://example.org/bar"},
+]
+
+
+def tmp_summary_cache(tmp_dir: str) -> ai_summarizer.SummaryCache:
+    summary_cache = ai_summarizer.SummaryCache()
+    summary_cache._cache = ExpireCache.build_cache(  # pylint: disable=protected-access
+        ExpireCacheCfg(name="TEST_AI_SUMMARY_CACHE", db_url=os.path.join(tmp_dir, "cache.db"))
+    )
+    return summary_cache
+
+
+class TestSanitizeUrl(SearxTestCase):
+
+    @parameterized.expand(
+        [
+            ('', ''),
+            ('https://example.org/path?q=1', 'https://example.org/path?q=1'),
+            ('https://user:pw@example.org:8080/', 'https://user:pw@example.org:8080/'),
+            ('https://bücher.de/', 'https://bücher.de/'),
+            ('https://example..org/', '[Invalid URL]'),
+            ('https://exa\ufffdmple.org/', '[Invalid URL]'),
+            ('https://' + 64 * 'a' + '.org/', '[Invalid URL]'),
+        ]
+    )
+    def test_sanitize_url(self, url: str, expected: str):
+        self.assertEqual(ai_summarizer.sanitize_url(url), expected)
+
+
+class TestFormatResults(SearxTestCase):
+
+    def test_format(self):
+        results = [SimpleNamespace(**r) for r in RESULTS]
+        prompt = ai_summarizer.format_results_for_prompt(results, "foo bar")
+        self.assertEqual(
+            prompt,
+            "\n".join(
+                [
+                    "Search Query: foo bar",
+                    "",
+                    "Search Results:",
+                    "",
+                    "1. Foo",
+                    "   Content: foo content",
+                    "   URL: https://example.org/foo",
+                    "",
+                    "2. Bar",
+                    "   Content: bar content",
+                    "   URL: https://example.org/bar",
+                    "",
+                ]
+            ),
+        )
+
+    def test_format_dicts(self):
+        prompt = ai_summarizer.format_results_for_prompt(RESULTS, "foo bar")
+        results = [SimpleNamespace(**r) for r in RESULTS]
+        self.assertEqual(prompt, ai_summarizer.format_results_for_prompt(results, "foo bar"))
+
+    def test_truncate_content(self):
+        results = [SimpleNamespace(title="Foo", content=1000 * "x", url="")]
+        prompt = ai_summarizer.format_results_for_prompt(results, "foo", max_results=10)
+        self.assertIn(f"   Content: {400 * 'x'}...\n", prompt)
+
+    def test_skip_empty_results(self):
+        results = [{"title": "", "content": "", "url": "https://example.org/empty"}] + RESULTS
+        prompt = ai_summarizer.format_results_for_prompt(results, "foo bar", max_results=1)
+        self.assertIn("1. Foo\n", prompt)
+        self.assertNotIn("empty", prompt)
+        self.assertNotIn("Bar", prompt)
+
+    def test_cached(self):
+        results = [dict(r) for r in RESULTS]
+        prompt = ai_summarizer.format_results_for_prompt(results, "foo bar")
+        self.assertIs(prompt, ai_summarizer.format_results_for_prompt([dict(r) for r in RESULTS], "foo bar"))
+
+        results[1]["content"] = "bar content changed"
+        self.assertIn("bar content changed", ai_summarizer.format_results_for_prompt(results, "foo bar"))
+
+    def test_cached_truncated_content(self):
+        results = [{"title": "Foo", "content": "x" * 1000 + "foo", "url": "https://example.org/foo"}]
+        prompt = ai_summarizer.format_results_for_prompt(results, "foo bar")
+        results[0]["content"] = "x" * 1000 + "bar"
+        self.assertIs(prompt, ai_summarizer.format_results_for_prompt(results, "foo bar"))
+        self.assertIn("x" * 400 + "...", prompt)
+
+    def test_no_results(self):
+        prompt = ai_summarizer.format_results_for_prompt([], "foo")
+        self.assertTrue(prompt.endswith("No results found."))
+
+    def test_max_results_zero(self):
+        prompt = ai_summarizer.format_results_for_prompt(RESULTS, "q", max_results=0)
+        self.assertEqual(prompt, "Search Query: q\n\nSearch Results:\n\nNo results found.")
+
+
+class TestUserPrompt(SearxTestCase):
+
+    def test_build_user_prompt(self):
+        for query, results in [("foo", "1. Foo"), ("{results}", "{query}"), ("", "")]:
+            self.assertEqual(
+                ai_summarizer.build_user_prompt(query, results),
+                ai_summarizer.DEFAULT_SUMMARY_PROMPT.format(query=query, results=results),
+            )
+
+
+class TestSummaryCache(SearxTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.tmp_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.summary_cache = tmp_summary_cache(self.tmp_dir.name)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+        super().tearDown()
+
+    def test_key_normalized_query(self):
+        key = self.summary_cache.key(RESULTS, "Foo  bar", model="m")
+        self.assertEqual(key, self.summary_cache.key(RESULTS, "bar foo", model="m"))
+        self.assertEqual(key, self.summary_cache.key(list(reversed(RESULTS)), "bar foo", model="m"))
+
+    def test_key_differs(self):
+        key = self.summary_cache.key(RESULTS, "foo bar", model="m")
+        self.assertNotEqual(key, self.summary_cache.key(RESULTS[:1], "foo bar", model="m"))
+        self.assertNotEqual(key, self.summary_cache.key(RESULTS, "foo baz", model="m"))
+        self.assertNotEqual(key, self.summary_cache.key(RESULTS, "foo bar", model="n"))
+
+    def test_put_get(self):
+        key = self.summary_cache.key(RESULTS, "foo bar", model="m")
+        self.assertIsNone(self.summary_cache.get(key))
+
+        response = {
+            "success": True,
+            "summary": "lorem ipsum",
+            "error": None,
+            "model": "m",
+            "timestamp": "2025-01-01T00:00:00",
+            "usage": {"total_tokens": 42},
+            "stats": {"total_tokens": 42, "model": "m"},
+        }
+        self.assertTrue(self.summary_cache.put(key, response))
+
+        cached = self.summary_cache.get(key)
+        self.assertIsNotNone(cached)
+        self.assertTrue(cached["success"])
+        self.assertEqual(cached["summary"], "lorem ipsum")
+        self.assertTrue(cached["stats"]["cache_hit"])
+
+    def test_put_failed(self):
+        key = self.summary_cache.key(RESULTS, "foo bar", model="m")
+        self.assertFalse(self.summary_cache.put(key, {"success": False, "error": "timeout"}))
+        self.assertIsNone(self.summary_cache.get(key))
+
+
+class TestClients(SearxTestCase):
+
+    def test_async_client_per_loop(self):
+        async def get_clients():
+            clients = ai_summarizer.get_async_client(), ai_summarizer.get_async_client()
+            await clients[0].aclose()
+            return clients
+
+        first, second = asyncio.run(get_clients())
+        self.assertIs(first, second)
+        third, _ = asyncio.run(get_clients())
+        self.assertIsNot(first, third)
+
+    def test_close_client_of_running_loop(self):
+        async def get_client():
+            return ai_summarizer.get_async_client()
+
+        first = asyncio.run_coroutine_threadsafe(get_client(), get_loop()).result()
+        second = asyncio.run(get_client())
+        asyncio.run_coroutine_threadsafe(asyncio.sleep(0.1), get_loop()).result()
+        self.assertTrue(first.is_closed)
+        self.assertFalse(second.is_closed)
+        asyncio.run(second.aclose())
+
+
+class TestGenerateSummarySync(SearxTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.tmp_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.requests: list[httpx.Request] = []
+        self.status_code = 200
+        self.response_json: dict = {
+            "choices": [{"message": {"content": " lorem ipsum "}}],
+            "usage": {"prompt_tokens": 40, "completion_tokens": 2, "total_tokens": 42},
+        }
+
+        self.exception: Exception | None = None
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            self.requests.append(request)
+            if self.exception is not None:
+                raise self.exception
+            return httpx.Response(self.status_code, json=self.response_json)
+
+        self.setattr4test(ai_summarizer, "SUMMARY_CACHE", tmp_summary_cache(self.tmp_dir.name))
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        self.setattr4test(ai_summarizer, "get_async_client", lambda: client)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+        super().tearDown()
+
+    def generate(self, **kwargs):
+        return ai_summarizer.generate_summary_sync(
+            results=RESULTS, query="foo bar", endpoint="https://example.org", model="m", **kwargs
+        )
+
+    def test_success(self):
+        result = self.generate(api_key="secret")
+        self.assertTrue(result["success"])
+        self.assertEqual(result["summary"], "lorem ipsum")
+        self.assertEqual(result["stats"]["total_tokens"], 42)
+
+        request = self.requests[0]
+        self.assertEqual(str(request.url), "https://example.org/v1/chat/completions")
+        self.assertEqual(request.headers["Authorization"], "Bearer secret")
+        payload = msgspec.json.decode(request.content)
+        self.assertEqual(payload["model"], "m")
+        self.assertIn("1. Foo", payload["messages"][1]["content"])
+        self.assertEqual(request.extensions["timeout"], {"connect": 10.0, "read": 15.0, "write": 15.0, "pool": 15.0})
+
+    def test_no_response(self):
+        cancelled = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:  # pylint: disable=unused-argument
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+            return httpx.Response(200, json=self.response_json)
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        self.setattr4test(ai_summarizer, "get_async_client", lambda: client)
+
+        # the mock transport has no timeouts, the result is awaited for
+        # timeout + SYNC_TIMEOUT_MARGIN sec.
+        self.setattr4test(ai_summarizer, "SYNC_TIMEOUT_MARGIN", 0)
+        result = self.generate(timeout=0.2)
+        self.assertFalse(result["success"])
+        self.assertEqual(result["error"], "Request timed out after 0.2s")
+        asyncio.run_coroutine_threadsafe(asyncio.sleep(0.1), get_loop()).result()
+        self.assertEqual(cancelled, [True])
+
+    def test_compress(self):
+        self.setattr4test(ai_summarizer, "REQUEST_COMPRESSION_MIN_SIZE", 0)
+        self.generate(compress=True)
+        request = self.requests[0]
+        self.assertEqual(request.headers["Content-Encoding"], "gzip")
+        payload = msgspec.json.decode(gzip.decompress(request.content))
+        self.assertEqual(payload["model"], "m")
+
+    def test_compress_small_body(self):
+        self.setattr4test(ai_summarizer, "REQUEST_COMPRESSION_MIN_SIZE", 1024 * 1024)
+        self.generate(compress=True)
+        request = self.requests[0]
+        self.assertNotIn("Content-Encoding", request.headers)
+        self.assertEqual(msgspec.json.decode(request.content)["model"], "m")
+
+    def test_cache_hit(self):
+        self.generate()
+        result = self.generate()
+        self.assertEqual(len(self.requests), 1)
+        self.assertTrue(result["success"])
+        self.assertTrue(result["stats"]["cache_hit"])
+
+    def test_cache_api_key(self):
+        self.generate(api_key="secret")
+        result = self.generate(api_key="other")
+        self.assertEqual(len(self.requests), 2)
+        self.assertNotIn("cache_hit", result["stats"])
+
+    def test_api_error(self):
+        self.status_code = 500
+        self.response_json = {"error": {"message": "model not found"}}
+        result = self.generate()
+        self.assertFalse(result["success"])
+        self.assertEqual(result["error"], "API returned error: 500 - model not found")
+
+    def test_no_choices(self):
+        self.response_json = {"choices": []}
+        result = self.generate()
+        self.assertFalse(result["success"])
+        self.assertEqual(result["error"], "No completion returned from API")
+
+    @parameterized.expand(
+        [
+            (httpx.ReadTimeout("timeout"), "Request timed out after 3s"),
+            (httpx.ConnectError("connection refused"), "Request failed: connection refused"),
+            (ValueError("foo"), "Unexpected error: foo"),
+        ]
+    )
+    def test_exceptions(self, exception, expected):
+        self.exception = exception
+        result = self.generate(timeout=3)
+        self.assertFalse(result["success"])
+        self.assertEqual(result["error"], expected)
+        self.assertIsNone(result["stats"])
+
+
+class TestGenerateSummary(SearxTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.tmp_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.setattr4test(ai_summarizer, "SUMMARY_CACHE", tmp_summary_cache(self.tmp_dir.name))
+        self.exception: Exception | None = None
+        self.response: httpx.Response = httpx.Response(500, json={"error": {"message": "model not found"}})
+
+        def handler(request: httpx.Request) -> httpx.Response:  # pylint: disable=unused-argument
+            if self.exception is not None:
+                raise self.exception
+            return self.response
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        self.setattr4test(ai_summarizer, "get_async_client", lambda: client)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+        super().tearDown()
+
+    async def generate(self):
+        results = [SimpleNamespace(**r) for r in RESULTS]
+        return await ai_summarizer.generate_summary(
+            results, "foo", endpoint="https://example.org", model="m", timeout=3
+        )
+
+    async def test_api_error(self):
+        with self.assertRaisesRegex(ai_summarizer.APIError, "API returned error: 500 - model not found"):
+            await self.generate()
+
+    async def test_cache_in_thread(self):
+        self.response = httpx.Response(200, json={"choices": [{"message": {"content": "lorem"}}]})
+        cache_threads = []
+        cache_get = ai_summarizer.SUMMARY_CACHE.get
+
+        def get(key):
+            cache_threads.append(threading.get_ident())
+            return cache_get(key)
+
+        self.setattr4test(ai_summarizer.SUMMARY_CACHE, "get", get)
+        self.assertEqual((await self.generate())["summary"], "lorem")
+        result = await self.generate()
+        self.assertTrue(result["stats"]["cache_hit"])
+        self.assertNotIn(threading.get_ident(), cache_threads)
+
+    async def test_timeout(self):
+        self.exception = httpx.ReadTimeout("timeout")
+        with self.assertRaisesRegex(ai_summarizer.TimeoutError, "Request timed out after 3s"):
+            await self.generate()
+
+
+class ChunkStream(httpx.AsyncByteStream):
+    """Response body that is received in ``chunks``, with ``keep_open`` the
+    server does not close the response after the last chunk."""
+
+    def __init__(self, chunks: list[bytes], keep_open: bool = False):
+        self._chunks = iter(chunks)
+        self._keep_open = keep_open
+
+    def __aiter__(self):  # pylint: disable=invalid-overridden-method
+        return self
+
+    async def __anext__(self) -> bytes:
+        try:
+            return next(self._chunks)
+        except StopIteration as exc:
+            if self._keep_open:
+                await asyncio.sleep(60)
+            raise StopAsyncIteration from exc
+
+
+class TestStreamGenerateSummary(SearxTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.chunks: list[bytes] = []
+        self.keep_open = False
+
+        def handler(request: httpx.Request) -> httpx.Response:  # pylint: disable=unused-argument
+            return httpx.Response(200, stream=ChunkStream(self.chunks, self.keep_open))
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        self.setattr4test(ai_summarizer, "get_async_client", lambda: client)
+
+    async def collect(self) -> list[str]:
+        results = [SimpleNamespace(**r) for r in RESULTS]
+        stream = ai_summarizer.stream_generate_summary(
+            results, "foo", endpoint="https://example.org", model="m", timeout=3
+        )
+        contents = [content async for content in stream]
+        # httpx closes the generators of a response that is not read to the end
+        # in tasks of the event loop, they have to run before the test's loop
+        # is closed
+        for _ in range(3):
+            await asyncio.sleep(0)
+        return contents
+
+    async def test_stream(self):
+        self.chunks = [
+            b'data: {"choices": [{"delta": {"content": "lorem"}}]}\n\n',
+            b'data: {"choices": [{"delta": {"con',
+            b'tent": " ipsum"}}]}\r\n\r\n: keep-alive\n\n',
+            b'data: {"choices": [{"delta": {}}]}\n\ndata: [DONE]\n\n',
+            b'data: {"choices": [{"delta": {"content": "after done"}}]}\n\n',
+        ]
+        self.assertEqual(await self.collect(), ["lorem", " ipsum"])
+
+    async def test_stream_open_after_done(self):
+        self.chunks = [b'data: {"choices": [{"delta": {"content": "lorem"}}]}\n\ndata: [DONE]\n\n']
+        self.keep_open = True
+        self.assertEqual(await asyncio.wait_for(self.collect(), 1), ["lorem"])
+
+    async def test_stream_without_final_newline(self):
+        self.chunks = [b'data: {"choices": [{"delta": {"content": "lorem"}}]}']
+        self.assertEqual(await self.collect(), ["lorem"])
+        self.chunks = [b'data: {"choices": [{"delta": {"content": "lorem"}}]}\n\ndata: [DONE]']
+        self.assertEqual(await self.collect(), ["lorem"])
+
+    async def test_stream_invalid_chunk(self):
+        self.chunks = [b'data: {invalid\n\ndata: {"choices": [{"delta": {"content": "lorem"}}]}\n\n']
+        self.assertEqual(await self.collect(), ["lorem"])
+
+
+class TestShouldGenerateSummary(SearxTestCase):
+
+    @parameterized.expand(
+        [
+            (None, 10, False),
+            ({}, 10, False),
+            ({"ai_summarizer": None}, 10, False),
+            ({"ai_summarizer": {"enabled": False, "endpoint": "e", "model": "m"}}, 10, False),
+            ({"ai_summarizer": {"enabled": True, "endpoint": "e", "model": "m"}}, 2, False),
+            ({"ai_summarizer": {"enabled": True, "endpoint": "e", "model": "m"}}, 3, True),
+            ({"ai_summarizer": {"enabled": True, "endpoint": "e", "model": "m", "min_results": 1}}, 1, True),
+            ({"ai_summarizer": {"enabled": True, "endpoint": "", "model": "m"}}, 10, False),
+            ({"ai_summarizer": {"enabled": True, "endpoint": "e"}}, 10, False),
+        ]
+    )
+    def test_should_generate_summary(self, preferences, results_count, expected):
+        self.assertEqual(ai_summarizer.should_generate_summary(preferences, results_count), expected)
+
+
+class TestFetchAvailableModels(SearxTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.requests: list[httpx.Request] = []
+        self.model_ids = ["m1", "m2"]
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            self.requests.append(request)
+            return httpx.Response(200, json={"data": [{"id": model_id} for model_id in self.model_ids]})
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        self.setattr4test(ai_summarizer, "get_async_client", lambda: client)
+        self.setattr4test(ai_summarizer, "_MODELS_CACHE", {})
+
+    async def test_cached(self):
+        self.assertEqual(await ai_summarizer.fetch_available_models("https://example.org", "key"), ["m1", "m2"])
+        self.assertEqual(await ai_summarizer.fetch_available_models("https://example.org", "key"), ["m1", "m2"])
+        self.assertEqual(len(self.requests), 1)
+        self.assertEqual(str(self.requests[0].url), "https://example.org/v1/models")
+
+        await ai_summarizer.fetch_available_models("https://example.org/v1/")
+        self.assertEqual(str(self.requests[1].url), "https://example.org/v1/models")
+
+        await ai_summarizer.fetch_available_models("https://example.org", "other key")
+        self.assertEqual(len(self.requests), 3)
+
+    async def test_stale_while_revalidate(self):
+        await ai_summarizer.fetch_available_models("https://example.org")
+        self.model_ids = ["m3"]
+        self.setattr4test(ai_summarizer, "MODELS_CACHE_TTL", 0)
+
+        # the stale list is returned, the refresh runs in the background
+        self.assertEqual(await ai_summarizer.fetch_available_models("https://example.org"), ["m1", "m2"])
+        await asyncio.gather(*ai_summarizer._MODELS_REFRESH.values())  # pylint: disable=protected-access
+        self.assertEqual(len(self.requests), 2)
+
+        self.setattr4test(ai_summarizer, "MODELS_CACHE_TTL", 300)
+        self.assertEqual(await ai_summarizer.fetch_available_models("https://example.org"), ["m3"])
+
+    async def test_many(self):
+        models = await ai_summarizer.fetch_available_models_many(
+            [("https://a.example.org", None), ("https://b.example.org", "key")]
+        )
+        self.assertEqual(models, {"https://a.example.org": ["m1", "m2"], "https://b.example.org": ["m1", "m2"]})
+        self.assertEqual(len(self.requests), 2)
+
+
+class TestIsoNow(SearxTestCase):
+
+    def test_iso_now(self):
+        timestamp = ai_summarizer._iso_now()  # pylint: disable=protected-access
+        parsed = datetime.datetime.fromisoformat(timestamp)
+        now = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+        self.assertLess(abs((now - parsed).total_seconds()), 5)
+        self.assertRegex(timestamp, r"^\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d\.\d{6}$")